@@ -0,0 +1,89 @@
+'''
+Kernels for checking a verifier against a batch of guesses at once.
+
+codes is a 2D numpy int array with one guess per row and every kernel returns a
+boolean array with one entry per guess. Verifier.batch_call dispatches here to check
+a verifier's hidden state against many guesses; evaluate_possibilities sticks to numpy
+expressions since a parallel launch per possibility costs more than it saves on the
+125 guesses of a 3-digit game. With numba these are compiled loops, without it we
+fall back to the same checks as whole-array numpy expressions.
+'''
+import numpy as np
+
+try:
+    from numba import njit, prange
+except ImportError:
+    njit = None
+
+if njit is not None:
+    @njit(cache=True, parallel=True)
+    def eval_isequalx(codes, pos, val):
+        out = np.empty(codes.shape[0], dtype=np.bool_)
+        for i in prange(codes.shape[0]):
+            out[i] = codes[i, pos] == val
+        return out
+
+    @njit(cache=True, parallel=True)
+    def eval_islessthanx(codes, pos, val):
+        out = np.empty(codes.shape[0], dtype=np.bool_)
+        for i in prange(codes.shape[0]):
+            out[i] = codes[i, pos] < val
+        return out
+
+    @njit(cache=True, parallel=True)
+    def eval_iseven_odd(codes, pos, parity):
+        out = np.empty(codes.shape[0], dtype=np.bool_)
+        for i in prange(codes.shape[0]):
+            out[i] = (codes[i, pos] & 1) == parity
+        return out
+
+    @njit(cache=True, parallel=True)
+    def eval_islessthan(codes, pos1, pos2):
+        out = np.empty(codes.shape[0], dtype=np.bool_)
+        for i in prange(codes.shape[0]):
+            out[i] = codes[i, pos1] < codes[i, pos2]
+        return out
+
+    @njit(cache=True, parallel=True)
+    def eval_ismin(codes, pos):
+        out = np.empty(codes.shape[0], dtype=np.bool_)
+        for i in prange(codes.shape[0]):
+            # Strictly the lowest: no other digit may be lower or equal
+            lowest = True
+            for digit in range(codes.shape[1]):
+                if digit != pos and codes[i, digit] <= codes[i, pos]:
+                    lowest = False
+                    break
+            out[i] = lowest
+        return out
+
+    @njit(cache=True, parallel=True)
+    def eval_dupdigits(codes, val, count):
+        out = np.empty(codes.shape[0], dtype=np.bool_)
+        for i in prange(codes.shape[0]):
+            n = 0
+            for digit in range(codes.shape[1]):
+                if codes[i, digit] == val:
+                    n += 1
+            out[i] = n == count
+        return out
+
+else:
+    def eval_isequalx(codes, pos, val):
+        return codes[:, pos] == val
+
+    def eval_islessthanx(codes, pos, val):
+        return codes[:, pos] < val
+
+    def eval_iseven_odd(codes, pos, parity):
+        return (codes[:, pos] & 1) == parity
+
+    def eval_islessthan(codes, pos1, pos2):
+        return codes[:, pos1] < codes[:, pos2]
+
+    def eval_ismin(codes, pos):
+        m = codes.min(axis=1)
+        return (codes[:, pos] == m) & ((codes == m[:, None]).sum(axis=1) == 1)
+
+    def eval_dupdigits(codes, val, count):
+        return (codes == val).sum(axis=1) == count
@@ -14,12 +14,39 @@ The goal of the game is for the player to find the solution that makes
 all verifiers return True in the fewest number of guesses.
 '''
 
+import argparse
+from collections import Counter
 from itertools import product
 from verifiers import *
 
+try:
+    import numpy as np
+except ImportError:
+    np = None # Optional: lets unique_combinations evaluate every guess at once
+
+# Our queries are tiny finite-domain problems (digits in [1, 5] plus selection flags), so skip
+# z3's automatic configuration and pick settings that suit them. Relevancy propagation only
+# slows down dense problems like ours
+z3.set_param('auto_config', False)
+z3.set_param('smt.arith.solver', 6)
+z3.set_param('smt.relevancy', 0)
+
+# Cheap preprocessing before handing off to the SMT core
+SOLVER_TACTIC = z3.Then('simplify', 'propagate-values', 'solve-eqs', 'smt', ctx=CTX)
+
+def make_solver():
+    '''
+    Create a solver configured for our queries. Fixing the seed keeps guesses reproducible
+    '''
+    s = SOLVER_TACTIC.solver()
+    s.set('smt.phase_selection', 5)
+    s.set('random_seed', 1)
+    return s
+
 class Game():
-    def __init__(self, num_digits=3):
+    def __init__(self, num_digits=3, verbose=False):
         self.num_digits = num_digits
+        self.verbose = verbose # Dump whole solvers when we hit an unsat state
         self.verifiers = verifiers_from_numbers([4, 9, 11, 14])
         #self.verifiers = [IsLessThanX(num_digits, 0, 3),
         #                  IsEvenOdd(num_digits, 0, 1),
@@ -29,6 +56,8 @@ class Game():
         #self.verifiers = [DuplicateDigits(None, 4, None, 2)] # 2x 4
         #self.verifiers = [IsMin(2), DuplicateDigits(None, 3, None, 2), IsLessThanX(2, 2)]
 
+        self.old_guess = [make_digit(f'old_guess{x}') for x in range(num_digits)] # Symbolic digits shared by past guesses
+
     def verifier(self, verifier_type, *args, **kwargs):
         '''
         Create a custom verifier. Pass num_digits
@@ -39,19 +68,18 @@ class Game():
     def run(self):
         self.report()
         self.results = {}
+        self.impossible_flags = set() # Names of selection flags ruled out by earlier guesses
         for i in range(100):
             print("-"*30)
             concrete_guess, solved = self.guess_loop()
+            # Our guess always comes from the solver so it's valid, skip the checks in __call__
+            verifier_output = {v: v._fast(concrete_guess) for v in self.verifiers}
+            all_true = all(verifier_output.values())
 
-            all_true = False
             if not solved:
-                verifier_output = {v: v(concrete_guess) for v in self.verifiers}
                 print(f"Guess {i+1}: {concrete_guess} returns")
-                all_true = True
-
                 for v, output in verifier_output.items():
                     print(f"\t{v.get_public_state()}: {output}")
-                    all_true &= output
                 self.results[concrete_guess] = verifier_output
 
             if solved or all_true:
@@ -59,94 +87,136 @@ class Game():
                 print(f"Alleged solution is {concrete_guess} after {i+1} guesses!")
                 print("Results:")
 
-                verifier_output = {v: v(concrete_guess) for v in self.verifiers}
-                correct = True
                 for v, output in verifier_output.items():
                     print(f"\t{v}: {output}")
-                    correct &= output
 
-                print("Solution is " + "VALID" if correct else "INVALID")
+                print("Solution is " + ("VALID" if all_true else "INVALID"))
                 print("*"*30)
                 return
 
+    def report_unsat(self, s):
+        '''
+        Describe an unsat solver. The full formula can be huge so we only dump it when verbose
+        '''
+        if self.verbose:
+            print(s)
+        else:
+            print(f"unsat after {len(s.assertions())} assertions")
+
     def filter_selected_flags(self, selection_flags):
         '''
         We have some prior guesses. Can they tell us about the hidden state of the verifiers?
         '''
-        s = z3.Solver()
+        s = make_solver()
 
-        # One of the selection flags must be true for each verifier. In our logic
+        # Exactly one of the selection flags must be true for each verifier. In our logic
         # this might end up evaluating to NOT 2 being true, but that should be okay?
-        # If not we might want PbGt 0 instead of PbEq 1
-        for v in self.verifiers:
-            s.add(z3.PbEq([(sel, 1) for sel in selection_flags[v]], 1))
+        # If not we might want to drop the AtMost
+        for flags in selection_flags.values():
+            s.add(z3.Or(*flags))
+            s.add(z3.AtMost(*flags, 1))
 
-        # For each guess in our history, create a new int for that guess, constrained to its actual value
+        # For each guess in our history, substitute its actual digits into our shared symbolic old guess.
+        # Each option then simplifies to True or False, so we add unit clauses rather than new variables
         for guess, results in self.results.items():
-            # Old guess is constrained to its actual value
-            old_guess = [z3.Int('old_guess' + ("_".join(map(str,guess))) + f'.{x}') for x in range(num_digits)]
-
-            # For each digit in the guess, constrain the old guess to be equal to the guess
-            for digit in range(len(old_guess)):
-                s.add(old_guess[digit] == guess[digit])
+            digits = list(zip(self.old_guess, map(digit_value, guess)))
 
             for v in self.verifiers:
-                opts = v.get_possibilities(old_guess) # These are the distinct options for this verifier
+                # These are the distinct options for this verifier
+                opts = [z3.simplify(z3.substitute(opt, *digits)) for opt in v.get_possibilities(self.old_guess)]
                 result = results[v] # What did this verifier return for this guess?
 
-                # Combine with selection flags to get the actual options we're checking
-                actual_opts = [z3.And(sel, opt) for sel, opt in zip(selection_flags[v], opts)]
-                #s.add(z3.Or(*actual_opts))
-
-                # The actual_ops expression evaluates to result. Add this to solver
-                s.add(z3.Implies(z3.Or(*actual_opts), result)) # XXX is implication correct?
+                # Whichever option is selected must evaluate to result
+                for sel, opt in zip(selection_flags[v], opts):
+                    s.add(z3.Implies(sel, opt == result))
 
         if s.check() == z3.unsat:
-            print(s)
+            self.report_unsat(s)
             raise ValueError("No solution found - are multiple guesses valid?")
 
-        # We've now added constraints for all the guesses. Now we can check to identify any impossible
-        # selection flags
+        # We've now added constraints for all the guesses. Now we can identify any impossible
+        # selection flags: a single consequences query tells us every flag that is forced false.
+        # Our history only ever grows, so a flag found impossible on an earlier guess is still
+        # impossible and we don't need to ask about it again
+        unknown = [sel for flags in selection_flags.values() for sel in flags if str(sel) not in self.impossible_flags]
+        if unknown:
+            _, consequences = s.consequences([], unknown)
+            for implication in consequences:
+                # Each consequence is Implies(True, sel) or Implies(True, Not(sel))
+                fixed = implication.arg(1)
+                if z3.is_not(fixed):
+                    self.impossible_flags.add(str(fixed.arg(0)))
+
         impossible = []
         for v in self.verifiers:
             for idx, sel in enumerate(selection_flags[v]):
-                s2 = z3.Solver()
-                for c in s.assertions():
-                    s2.add(c)
-                s2.add(sel)
-
-                if s2.check() == z3.unsat:
+                if str(sel) in self.impossible_flags:
                     # Adding SEL is unsat so SEL must not be a flag we want
                     # we'll replace 'old_guess_0_3_3.0  with digit3
                     #pretty_name = str(opts[idx]).split(" ")
                     #pretty_name  = ("digit" + pretty_name[0][pretty_name[0].rindex(".")+1:] + " ") + " ".join(pretty_name[1:])
                     #print(f"Given what we've seen verifier {v} cannot be checking condition {idx}: {pretty_name}")
-                    print(f"Given what we've seen verifier {v} cannot be checking condition {idx}:\n\t{opts[idx]}")
+                    print(f"Given what we've seen verifier {v} cannot be checking condition {idx}:\n\t{v.get_possibilities(self.old_guess)[idx]}")
                     impossible.append((v, sel))
 
         # Return a list of selection flags that are impossible
         return impossible
 
+    def unique_combinations(self, selection_flags):
+        '''
+        Enumerate every concrete guess and count how many guesses each combination of selection
+        flags (one per verifier) allows. Returns the combinations that allow exactly one guess.
+        The guess space is tiny (5**num_digits) so this is far cheaper than asking z3 about each
+        combination
+        '''
+        guesses = product(range(1, 6), repeat=self.num_digits)
+
+        if np is not None:
+            # Evaluate every verifier over all guesses at once. Then walk the verifiers, expanding each
+            # (guess, partial combination) pair into one pair per possibility that holds for that guess.
+            # A combination's id numbers its possibilities in mixed radix, so counting ids counts guesses
+            codes = np.array(list(guesses), dtype=np.int8)
+            tables = [np.column_stack(v.evaluate_possibilities(codes)) for v in self.verifiers]
+            rows = np.arange(len(codes))
+            ids = np.zeros(len(codes), dtype=np.int64)
+            for table in tables:
+                pair, option = np.nonzero(table[rows])
+                rows = rows[pair]
+                ids = ids[pair] * table.shape[1] + option
+            combinations, counts = np.unique(ids, return_counts=True)
+            unique = np.unravel_index(combinations[counts == 1], [table.shape[1] for table in tables])
+            flags = list(selection_flags.values())
+            return [tuple(flags[idx][i] for idx, i in enumerate(combination)) for combination in zip(*unique)]
+
+        solutions = Counter()
+        for concrete_guess in guesses:
+            options = [[sel for sel, possible in zip(flags, v.evaluate_possibilities(concrete_guess)) if possible]
+                       for v, flags in selection_flags.items()]
+            solutions.update(product(*options))
+        return [combination for combination, count in solutions.items() if count == 1]
+
     def guess_loop(self):
+        nd = self.num_digits
 
         # Create our solver for this guess attempt
-        s = z3.Solver()
+        s = make_solver()
 
         # Create symbolic guess values for each digit
-        guess = [z3.Int(f'guess{x}') for x in range(num_digits)]
+        guess = [make_digit(f'guess{x}') for x in range(nd)]
 
         # Constrain each digit to be in range [1, 5]
         for digit in guess:
-            s.add(digit >= 1, digit <= 5)
+            s.add(z3.UGE(digit, 1), z3.ULE(digit, 5))
 
         # For each verifier, create a list of selection flags and store that at least one must be true
         selection_flags = {} # verifier -> [selection flags]
         selection_possibilities = {} # verifier -> Count of selection flags
         for v in self.verifiers:
-            selection_flags[v] = [z3.Bool(f'selected_{v}_{i}') for i in range(v.get_n_possibilities(guess))]
+            selection_flags[v] = [z3.Bool(f'selected_{v}_{i}', ctx=CTX) for i in range(v.get_n_possibilities(guess))]
 
-            # One must be true
-            s.add(z3.PbEq([(sel, 1) for sel in selection_flags[v]], 1))
+            # Exactly one must be true
+            s.add(z3.Or(*selection_flags[v]))
+            s.add(z3.AtMost(*selection_flags[v], 1))
 
             # Get all possible outputs for this verifier, set selection flag to imply each output
             possibilities = v.get_possibilities(guess)
@@ -154,33 +224,8 @@ class Game():
             for idx, (sel, opt) in enumerate(zip(selection_flags[v], possibilities)):
                 s.add(z3.Implies(sel, opt))
 
-        # Generate combinations
-        verifiers = list(selection_flags.keys())
-        flag_combinations = product(*(selection_flags[v] for v in verifiers))
-
-        # Now iterate over these combinations and test each one
-        for combination in flag_combinations:
-            s_test = z3.Solver()
-            # Add all existing constraints
-            for c in s.assertions():
-                s_test.add(c)
-            # Add the specific combination of selection flags
-            for flag in combination:
-                s_test.add(flag)
-
-            if s_test.check() == z3.unsat:
-                s.add(z3.Not(z3.And(*[combination])))
-                continue
-
-            # Get model, add constraint that we can't use this again
-            m = s_test.model()
-            first_solution = [m[guess[digit]].as_long() for digit in range(num_digits)]
-            s_test.add(z3.Or([guess[digit] != first_solution[digit] for digit in range(num_digits)]))
-
-            # Check for another solution
-            if s_test.check() == z3.sat:
-                #print("Multiple solutions found for:", combination)
-                s.add(z3.Not(z3.And(*[combination])))
+        # Only a combination of selection flags (one per verifier) with a single solution can be the real one
+        s.add(z3.Or([z3.And(*combination) for combination in self.unique_combinations(selection_flags)]))
 
         # With the correct set of selection flags (i.e., one of each), only a single solution would be possible.
         # This doesn't express well in boolean logic. Instead let's enumerate and test
@@ -193,20 +238,17 @@ class Game():
 
         if len(self.results) > 0:
             # Try to enforce that we don't re-try old guesses. BUT if that's not possible, allow it
-            s2 = z3.Solver()
-            for c in s.assertions():
-                s2.add(c)
-
+            s.push()
             for old_guess, details in self.results.items():
                 # Add constraint that our guess must not be the same as any previous guess
-                s2.add(z3.Not(z3.And(*[old == new for old, new in zip(old_guess, guess)])))
+                s.add(z3.Not(z3.And(*[old == new for old, new in zip(old_guess, guess)])))
 
-            if s2.check() != z3.unsat:
-                s = s2
+            if s.check() == z3.unsat:
+                s.pop()
 
 
         if s.check() == z3.unsat:
-            print(s)
+            self.report_unsat(s)
             raise ValueError("No solution found")
 
         m = s.model()
@@ -225,7 +267,7 @@ class Game():
         return (concrete_guess, solved)
 
     def report(self, show_hidden=True):
-        print(f"Public game state: {num_digits} digits with {len(self.verifiers)} verifiers:")
+        print(f"Public game state: {self.num_digits} digits with {len(self.verifiers)} verifiers:")
         for idx, v in enumerate(self.verifiers):
             print(f"\tVerifier {idx}: {v.get_public_state()}")
         print()
@@ -238,4 +280,7 @@ class Game():
 
 
 if __name__ == '__main__':
-    Game().run()
+    parser = argparse.ArgumentParser(description="Solve a game of Turing Machine")
+    parser.add_argument('--verbose', action='store_true', help="Print the full solver state on failure")
+    args = parser.parse_args()
+    Game(verbose=args.verbose).run()
@@ -1,5 +1,39 @@
+from collections import OrderedDict
+import functools
+from itertools import permutations
 import z3
 
+try:
+    import numpy as np
+except ImportError:
+    np = None # Optional: only needed to evaluate many guesses at once
+
+if np is not None:
+    import _kernels # numba is optional, _kernels falls back to plain numpy without it
+else:
+    _kernels = None
+
+# z3 functions we use while building possibilities, bound once to skip the module attribute lookups
+_And, _If, _ULT, _substitute = z3.And, z3.If, z3.ULT, z3.substitute
+
+# Symbolic guesses are tuples of 3-bit bitvectors: enough for digits in [1, 5] and z3 can
+# bit-blast them directly instead of combining integer arithmetic with everything else.
+# Bitvector < is signed in z3, so the possibilities compare digits with ULT
+DIGIT_BITS = 3
+
+# Every term we build lives in this one context. Mixing contexts makes z3 translate terms
+# between them behind our back, so guesses passed to the verifiers must come from make_digit
+# (or otherwise be created with ctx=CTX)
+CTX = z3.main_ctx()
+
+def make_digit(name):
+    ''' A symbolic guess digit '''
+    return z3.BitVec(name, DIGIT_BITS, ctx=CTX)
+
+def digit_value(value):
+    ''' A concrete guess digit to substitute for a symbolic one '''
+    return z3.BitVecVal(value, DIGIT_BITS, ctx=CTX)
+
 # These are the verifier cards used in the actual game with
 # their numerical IDs and descriptions.
 
@@ -8,6 +42,10 @@ class Verifier():
     '''
     Base class for a verifier. 
     '''
+    # Subclasses declare their own (usually empty) __slots__ so instances stay small
+    __slots__ = ('num_digits', 'position1', 'value1', 'position2', 'value2', '_public_state', '_repr', '_fast',
+                 '_possibilities_constant')
+
     def __init__(self, num_digits, position1, value1=None, position2=None, value2=None):
         '''
         Store hidden state
@@ -24,20 +62,33 @@ class Verifier():
         self.position2 = position2
         self.value2 = value2
 
-    def get_public_state(self, extra=None):
+        # These are printed every guess, so only format them once
+        self._public_state = self.format_public_state()
+        self._repr = self.format_repr()
+        self._possibilities_constant = self.constant_possibilities()
+        self.compile()
+
+    def format_public_state(self, extra=None):
         # Return subclass name. Subclass can provide extra info if it wants
         return self.__class__.__name__ + (f"({extra})" if extra else "")
 
+    def get_public_state(self):
+        return self._public_state
+
     def __call__(self, guess):
         ''' To be implemented by subclass '''
         if len(guess) != self.num_digits:
             raise ValueError(f"guess must be length {self.num_digits}: but it's {len(guess)}")
 
-        for digit in range(self.num_digits):
-            if not (0 < guess[digit] < 6):
-                raise ValueError(f"guess[{digit}] must be in range [1, 5]: but it's {guess[digit]}")
+        if min(guess) < 1 or max(guess) > 5:
+            # Only go looking for the bad digit once we know there is one
+            digit = next(digit for digit, value in enumerate(guess) if not 1 <= value <= 5)
+            raise ValueError(f"guess[{digit}] must be in range [1, 5]: but it's {guess[digit]}")
             
     def __repr__(self) -> str:
+        return self._repr
+
+    def format_repr(self):
         r = f"{self.__class__.__name__}({self.position1}"
         if self.value1:
             r += f", {self.value1}"
@@ -48,260 +99,425 @@ class Verifier():
         r += ")"
         return r
 
+    def build_possibilities(self, guess):
+        raise NotImplementedError("build_possibilities must be implemented by subclass")
+
+    def constant_possibilities(self):
+        '''
+        Some configurations give the same answer for every guess in [1, 5] (e.g., a digit
+        can never be less than 1). Subclasses return those possibilities here as z3
+        constants so get_possibilities can skip building terms z3 would only simplify away.
+        None if the possibilities depend on the guess
+        '''
+        return None
+
     def get_possibilities(self, guess):
-        raise NotImplementedError("get_possibilities must be implemented by subclass")
+        '''
+        Return the z3 expressions for each possibility of this verifier over
+        the symbolic guess. These are built once per verifier configuration
+        and then specialized to guess by substitution. We're asked about the
+        same symbolic guesses over and over so those results are cached too
+        '''
+        if self._possibilities_constant is not None:
+            return list(self._possibilities_constant)
+
+        config = (type(self), self.num_digits, self.position1, self.value1, self.position2, self.value2)
+        key = (config, tuple(g.get_id() for g in guess))
+        if key in _POSSIBILITIES_CACHE:
+            _POSSIBILITIES_CACHE.move_to_end(key)
+        else:
+            template_guess, template = _possibilities_template(*config)
+            # Keep guess alive with the result so its ids can't be reused by other terms
+            _POSSIBILITIES_CACHE[key] = (tuple(guess), [_substitute(t, *zip(template_guess, guess)) for t in template])
+            if len(_POSSIBILITIES_CACHE) > _POSSIBILITIES_CACHE_SIZE:
+                _POSSIBILITIES_CACHE.popitem(last=False)
+        return list(_POSSIBILITIES_CACHE[key][1])
+
+    def evaluate_possibilities(self, guess):
+        '''
+        Concrete version of get_possibilities: guess is a tuple of ints and we
+        return whether each possibility holds for it.
+
+        guess can also be a 2D numpy array with one guess per row, in which case
+        each possibility is a boolean array with one entry per guess
+        '''
+        raise NotImplementedError("evaluate_possibilities must be implemented by subclass")
+
+    def compile(self):
+        '''
+        Build self._fast: a version of __call__ for trusted guesses with the
+        hidden state captured in a closure and no input validation. Subclasses
+        should override this, by default we just use __call__
+        '''
+        self._fast = self.__call__
+        return self._fast
+
+    def batch_call(self, codes):
+        '''
+        Check a 2D numpy array of guesses, one per row, and return a boolean array
+        of results. Subclasses dispatch to a kernel in _kernels, by default we just
+        check each row
+        '''
+        _require_kernels()
+        return np.array([self._fast(tuple(row)) for row in codes], dtype=bool)
 
     def get_n_possibilities(self, guess):
         # Call subclass to get possibilities, then return length
         return len(self.get_possibilities(guess))
 
+def _is_batch(guess):
+    ''' Is guess a numpy array of guesses rather than a single guess? '''
+    return np is not None and isinstance(guess, np.ndarray)
+
+def _require_kernels():
+    ''' The _kernels module, or a clear error if numpy isn't installed '''
+    if _kernels is None:
+        raise ImportError("checking a batch of guesses requires numpy")
+    return _kernels
+
+def _count(guess, value):
+    '''
+    Bitvector term counting the digits of guess equal to value. It's just wide enough
+    to hold len(guess) so we don't mix integer arithmetic into our bitvector queries
+    '''
+    width = len(guess).bit_length()
+    one, zero = z3.BitVecVal(1, width, ctx=CTX), z3.BitVecVal(0, width, ctx=CTX)
+    return functools.reduce(lambda a, b: a + b, [_If(x == value, one, zero, ctx=CTX) for x in guess])
+
+# (verifier configuration, ids of guess digits) -> (guess, possibilities), least recently used first.
+# A game only asks about a couple of symbolic guesses per verifier, so a few hundred entries covers
+# several games without pinning every guess we've ever seen
+_POSSIBILITIES_CACHE = OrderedDict()
+_POSSIBILITIES_CACHE_SIZE = 256
+
+@functools.lru_cache(maxsize=None)
+def _possibilities_template(cls, num_digits, position1, value1, position2, value2):
+    '''
+    Build the possibilities for a verifier configuration against canonical
+    symbolic digits. Returns (template_guess, possibilities)
+    '''
+    template_guess = [make_digit(f'_g{x}') for x in range(num_digits)]
+    verifier = cls(num_digits, position1, value1, position2, value2)
+    return template_guess, verifier.build_possibilities(template_guess)
+
 class IsEqualX(Verifier):
     ''' Check if a single entry in guess is equal to a value '''
     ''' Known state: value, but not position'''
+    __slots__ = ()
+
     def __call__(self, guess):
         super().__call__(guess)
         return guess[self.position1] == self.value1
 
-    def get_public_state(self):
-        return super().get_public_state(self.value1)
+    def format_public_state(self):
+        return super().format_public_state(self.value1)
 
-    def get_possibilities(self, guess):
+    def build_possibilities(self, guess):
         return [x == self.value1 for x in guess]
 
+    def constant_possibilities(self):
+        # No digit can equal a value outside [1, 5]
+        if not 1 <= self.value1 <= 5:
+            return [z3.BoolVal(False, ctx=CTX)] * self.num_digits
+        return None
+
+    def evaluate_possibilities(self, guess):
+        if _is_batch(guess):
+            return list(guess.T == self.value1)
+        return [x == self.value1 for x in guess]
+
+    def compile(self):
+        self._fast = lambda guess, p=self.position1, v=self.value1: guess[p] == v
+        return self._fast
+
+    def batch_call(self, codes):
+        return _require_kernels().eval_isequalx(codes, self.position1, self.value1)
+
 class DuplicateDigits(Verifier):
     ''' Check if the number of duplicate digits in the guess is equal to a value '''
     ''' Known state: value1 (digit), but not count (value2)'''
+    __slots__ = ()
+
     def __call__(self, guess):
         super().__call__(guess)
         # Count the number of times value1 appears in the guess
-        return sum([1 for x in guess if x == self.value1]) == self.value2
+        return guess.count(self.value1) == self.value2
 
-    def get_public_state(self):
-        return super().get_public_state(self.value1)
+    def format_public_state(self):
+        return super().format_public_state(self.value1)
 
-    def get_possibilities(self, guess):
-        # Each result for value2
-        results = []
-        for target in range(self.num_digits+1):
-            # For target number, see if target digit (value1) appears that many times
-            results.append(z3.And(*[z3.PbEq([(x == self.value1, 1) for x in guess], target)]))
-        return results
+    def build_possibilities(self, guess):
+        # Each result for value2: see if target digit (value1) appears that many times.
+        # All the possibilities share a single count term
+        count = _count(guess, self.value1)
+        return [count == target for target in range(self.num_digits+1)]
+
+    def constant_possibilities(self):
+        # No digit can be a value outside [1, 5], so it always appears 0 times
+        if not 1 <= self.value1 <= 5:
+            return [z3.BoolVal(target == 0, ctx=CTX) for target in range(self.num_digits+1)]
+        return None
+
+    def evaluate_possibilities(self, guess):
+        if _is_batch(guess):
+            count = (guess == self.value1).sum(axis=1)
+        else:
+            count = guess.count(self.value1)
+        return [count == target for target in range(self.num_digits+1)]
+
+    def compile(self):
+        self._fast = lambda guess, d=self.value1, n=self.value2: guess.count(d) == n
+        return self._fast
+
+    def batch_call(self, codes):
+        return _require_kernels().eval_dupdigits(codes, self.value1, self.value2)
     
 class IsLessThanX(Verifier):
     ''' Check if a single entry in guess is less than a value '''
     ''' Known state: value, but not position'''
+    __slots__ = ()
+
     def __call__(self, guess):
         super().__call__(guess)
         return guess[self.position1] < self.value1
 
-    def get_public_state(self):
-        return super().get_public_state(self.value1)
+    def format_public_state(self):
+        return super().format_public_state(self.value1)
     
-    def get_possibilities(self, guess):
+    def build_possibilities(self, guess):
+        return [_ULT(x, self.value1) for x in guess]
+
+    def constant_possibilities(self):
+        # Every digit is at least 1 and at most 5
+        if self.value1 <= 1:
+            return [z3.BoolVal(False, ctx=CTX)] * self.num_digits
+        if self.value1 > 5:
+            return [z3.BoolVal(True, ctx=CTX)] * self.num_digits
+        return None
+
+    def evaluate_possibilities(self, guess):
+        if _is_batch(guess):
+            return list(guess.T < self.value1)
         return [x < self.value1 for x in guess]
+
+    def compile(self):
+        self._fast = lambda guess, p=self.position1, v=self.value1: guess[p] < v
+        return self._fast
+
+    def batch_call(self, codes):
+        return _require_kernels().eval_islessthanx(codes, self.position1, self.value1)
     
 class IsEvenOdd(Verifier):
     ''' Check if a single entry in guess is even or odd. Even if value==0 '''
     ''' Known state: even(vs odd) but not position'''
+    __slots__ = ('_expected_parity',)
+
+    def __init__(self, num_digits, position1, value1=None, position2=None, value2=None):
+        # Low bit we expect the digit to have. Set first, compile() in the base class needs it
+        self._expected_parity = 0 if value1 else 1
+        super().__init__(num_digits, position1, value1, position2, value2)
+
     def __call__(self, guess):
         super().__call__(guess)
-        return guess[self.position1] % 2 == (0 if self.value1 else 1)
+        return (guess[self.position1] & 1) == self._expected_parity
     
-    def get_public_state(self):
-        return super().get_public_state("even" if self.value1 else "odd")
+    def format_public_state(self):
+        return super().format_public_state("even" if self.value1 else "odd")
 
-    def get_possibilities(self, guess):
-        return [x % 2 == (0 if self.value1 else 1) for x in guess]
+    def build_possibilities(self, guess):
+        return [(x & 1) == self._expected_parity for x in guess]
+
+    def evaluate_possibilities(self, guess):
+        if _is_batch(guess):
+            return list((guess.T & 1) == self._expected_parity)
+        return [(x & 1) == self._expected_parity for x in guess]
+
+    def compile(self):
+        self._fast = lambda guess, p=self.position1, r=self._expected_parity: (guess[p] & 1) == r
+        return self._fast
+
+    def batch_call(self, codes):
+        return _require_kernels().eval_iseven_odd(codes, self.position1, self._expected_parity)
     
 
+@functools.lru_cache(maxsize=None)
+def _position_pairs(num_digits):
+    '''
+    Every ordered pair of distinct positions. Both orders are needed: (1, 0)
+    is as valid a hidden state for IsLessThan as (0, 1)
+    '''
+    return tuple(permutations(range(num_digits), 2))
+
 class IsLessThan(Verifier):
     ''' Check if the digit in position1 is less than the digit in position2 '''
     ''' Neither position is known '''
+    __slots__ = ()
+
     def __call__(self, guess):
         super().__call__(guess)
         return guess[self.position1] < guess[self.position2]
     
-    def get_possibilities(self, guess):
-        # For each digit, it can be greater than any digit that comes after it
-        #return [x < y for x in guess for y in guess[guess.index(x)+1:]]
-        #return [guess[0] < guess[1], guess[0] < guess[2], guess[1] < guess[2]]
-        result = []
-        for p1, p2 in zip(range(self.num_digits), range(self.num_digits)):
-            if p1 != p2:
-                result.append(guess[p1] < guess[p2])
-        return result
+    def build_possibilities(self, guess):
+        # Any ordered pair of distinct positions could be (position1, position2)
+        return [_ULT(guess[p1], guess[p2]) for p1, p2 in _position_pairs(self.num_digits)]
+
+    def evaluate_possibilities(self, guess):
+        if _is_batch(guess):
+            # Compare whole columns of digits
+            guess = guess.T
+        return [guess[p1] < guess[p2] for p1, p2 in _position_pairs(self.num_digits)]
+
+    def compile(self):
+        self._fast = lambda guess, p1=self.position1, p2=self.position2: guess[p1] < guess[p2]
+        return self._fast
+
+    def batch_call(self, codes):
+        return _require_kernels().eval_islessthan(codes, self.position1, self.position2)
         
 
 class IsMin(Verifier):
     ''' Check if the digit in position1 is the lowest '''
+    __slots__ = ()
+
     def __call__(self, guess):
         super().__call__(guess)
-        result = True
-        for digit in range(self.num_digits):
-            if digit != self.position1:
-                result &= guess[self.position1] < guess[digit]
-        return result
+        # Strictly the lowest, so the min can't be tied with another digit
+        m = min(guess)
+        return guess[self.position1] == m and guess.count(m) == 1
     
-    def get_possibilities(self, guess):
-        results = []
-        for target in range(self.num_digits):
-             # For each target digit, we have a possibility that it's the min
-             results.append(z3.And(*[guess[target] < guess[digit] for digit in range(self.num_digits) if digit != target]))
-        return results 
+    def build_possibilities(self, guess):
+        # For each target digit, we have a possibility that it's the min and no other digit ties it.
+        # All the possibilities share a single min term and a count of the digits equal to it
+        m = functools.reduce(lambda a, b: _If(_ULT(a, b), a, b, ctx=CTX), guess)
+        unique = _count(guess, m) == 1
+        return [_And(x == m, unique, CTX) for x in guess]
+
+    def evaluate_possibilities(self, guess):
+        if _is_batch(guess):
+            m = guess.min(axis=1)
+            unique = (guess == m[:, None]).sum(axis=1) == 1
+            return [unique & (x == m) for x in guess.T]
+        m = min(guess)
+        unique = guess.count(m) == 1
+        return [unique and x == m for x in guess]
+
+    def compile(self):
+        def fast(guess, p=self.position1):
+            m = min(guess)
+            return guess[p] == m and guess.count(m) == 1
+        self._fast = fast
+        return self._fast
+
+    def batch_call(self, codes):
+        return _require_kernels().eval_ismin(codes, self.position1)
 
 
 # FOR 3 DIGIT GAMEPLAY: 0=triangle, 1=square, 2=circle
-game = {
-    1: {"desc": "the △ number compared to 1",
-        "model": None},
-    2: {"desc": "the △ number compared to 3",
-        "model": None},
-    3: {"desc": "the □ number compared to 3",
-        "model": None},
-    4: {"desc": "the □ number compared to 4",
-        "model": None},
-    5: {"desc": "if △ is even or odd",
-        "model": None},
-    6: {"desc": "if □ is even or odd",
-        "model": None},
-    7: {"desc": "if ○ is even or odd",
-        "model": None},
-    8: {"desc": "the number of 1s in the code",
-        "model": None},
-    9: {"desc": "the number of 3s in the code",
-        "model": None},
-    10: {"desc": "the number of 4s in the code",
-         "model": None},
-    11: {"desc": "the △ number compared to the □ number",
-         "model": None},
-    12: {"desc": "the △ number compared to the ○ number",
-         "model": None},
-    13: {"desc": "the □ number compared to the ○ number",
-         "model": None},
-    14: {"desc": "which colour's number is smaller than either of the others",
-         "model": None},
-    15: {"desc": "which colour's number is larger than either of the others",
-         "model": None},
-    16: {"desc": "the number of even numbers compared to the number of odd numbers",
-         "model": None},
-    17: {"desc": "how many even numbers there are in the code",
-         "model": None},
-    18: {"desc": "if the sum of all the numbers is even or odd",
-         "model": None},
-    19: {"desc": "the sum of △ and □ compared to 6",
-         "model": None},
-    20: {"desc": "if a number repeats itself in the code",
-         "model": None},
-    21: {"desc": "if there is a number present exactly twice",
-         "model": None},
-    22: {"desc": "if the 3 numbers in the code are in ascending order, descending order, or no order",
-         "model": None},
-    23: {"desc": "the sum of all numbers compared to 6",
-         "model": None},
-    24: {"desc": "if there is a sequence of ascending numbers",
-         "model": None},
-    25: {"desc": "if there is a sequence of ascending or descending numbers",
-         "model": None},
-    26: {"desc": "that a specific colour is less than 3",
-         "model": None},
-    27: {"desc": "that a specific colour is less than 4",
-         "model": None},
-    28: {"desc": "that a specific colour is equal to 1",
-         "model": None},
-    29: {"desc": "that a specific colour is equal to 3",
-         "model": None},
-    30: {"desc": "that a specific colour is equal to 4",
-         "model": None},
-    31: {"desc": "that a specific colour is greater than 1",
-         "model": None},
-    32: {"desc": "that a specific colour is greater than 3",
-         "model": None},
-    33: {"desc": "that a specific colour is even or odd",
-         "model": None},
-    34: {"desc": "which colour has the smallest number (or is tied for the smallest number)",
-         "model": None},
-    35: {"desc": "which colour has the largest number (or is tied for the largest number)",
-         "model": None},
-    36: {"desc": "the sum of all the numbers is a multiple of 3 or 4 or 5",
-         "model": None},
-    37: {"desc": "the sum of 2 specific colours is equal to 4",
-         "model": None},
-    38: {"desc": "the sum of 2 specific colours is equal to 6",
-         "model": None},
-    39: {"desc": "the number of one specific colour compared to 1",
-         "model": None},
-    40: {"desc": "the number of one specific colour compared to 3",
-         "model": None},
-    41: {"desc": "the number of one specific colour compared to 4",
-         "model": None},
-    42: {"desc": "which colour is the smallest or the largest",
-         "model": None},
-
-    43: {"desc": "the △ number compared to the number of another specific colour",
-         "model": None},
-    44: {"desc": "the □ number compared to the number of another specific colour",
-         "model": None},
-    45: {"desc": "how many 1s OR how many 3s there are in the code",
-         "model": None},
-    46: {"desc": "how many 3s OR how many 4s there are in the code",
-         "model": None},
-    47: {"desc": "how many 1s OR how many 4s there are in the code",
-         "model": None},
-    48: {"desc": "one specific colour compared to another specific colour",
-         "model": None},
+DESCRIPTIONS = {
+    1: "the △ number compared to 1",
+    2: "the △ number compared to 3",
+    3: "the □ number compared to 3",
+    4: "the □ number compared to 4",
+    5: "if △ is even or odd",
+    6: "if □ is even or odd",
+    7: "if ○ is even or odd",
+    8: "the number of 1s in the code",
+    9: "the number of 3s in the code",
+    10: "the number of 4s in the code",
+    11: "the △ number compared to the □ number",
+    12: "the △ number compared to the ○ number",
+    13: "the □ number compared to the ○ number",
+    14: "which colour's number is smaller than either of the others",
+    15: "which colour's number is larger than either of the others",
+    16: "the number of even numbers compared to the number of odd numbers",
+    17: "how many even numbers there are in the code",
+    18: "if the sum of all the numbers is even or odd",
+    19: "the sum of △ and □ compared to 6",
+    20: "if a number repeats itself in the code",
+    21: "if there is a number present exactly twice",
+    22: "if the 3 numbers in the code are in ascending order, descending order, or no order",
+    23: "the sum of all numbers compared to 6",
+    24: "if there is a sequence of ascending numbers",
+    25: "if there is a sequence of ascending or descending numbers",
+    26: "that a specific colour is less than 3",
+    27: "that a specific colour is less than 4",
+    28: "that a specific colour is equal to 1",
+    29: "that a specific colour is equal to 3",
+    30: "that a specific colour is equal to 4",
+    31: "that a specific colour is greater than 1",
+    32: "that a specific colour is greater than 3",
+    33: "that a specific colour is even or odd",
+    34: "which colour has the smallest number (or is tied for the smallest number)",
+    35: "which colour has the largest number (or is tied for the largest number)",
+    36: "the sum of all the numbers is a multiple of 3 or 4 or 5",
+    37: "the sum of 2 specific colours is equal to 4",
+    38: "the sum of 2 specific colours is equal to 6",
+    39: "the number of one specific colour compared to 1",
+    40: "the number of one specific colour compared to 3",
+    41: "the number of one specific colour compared to 4",
+    42: "which colour is the smallest or the largest",
+    43: "the △ number compared to the number of another specific colour",
+    44: "the □ number compared to the number of another specific colour",
+    45: "how many 1s OR how many 3s there are in the code",
+    46: "how many 3s OR how many 4s there are in the code",
+    47: "how many 1s OR how many 4s there are in the code",
+    48: "one specific colour compared to another specific colour",
 }
-#
-#game[1]['model'] = CompareDigitToConstant(digit=0, compared_to_constant=1, private_comparor=None)
-#game[2]['model'] = CompareDigitToConstant(digit=0, compared_to_constant=3, private_comparor=None)
-#game[3]['model'] = CompareDigitToConstant(digit=1, compared_to_constant=3, private_comparor=None)
-game[4]['model'] = CompareDigitToConstant(digit=1, compared_to_constant=4, private_comparor=None)
-#game[5]['model'] = IsEvenOddDigit(digit=0, private_even=None)
-#game[6]['model'] = IsEvenOddDigit(digit=1, private_even=None)
-#game[7]['model'] = IsEvenOddDigit(digit=2, private_even=None)
-#game[8]['model'] = CountDigits(count_of=1, private_count=None)
-game[9]['model'] = CountDigits(count_of=3, private_count=None)
-#game[10]['model'] = CountDigits(count_of=4, private_count=None)
-game[11]['model'] = CompareDigitToDigit(digit1=0, digit2=1, private_comparor=None)
-#game[12]['model'] = CompareDigitToDigit(digit1=0, digit2=2, private_comparor=None)
-#game[13]['model'] = CompareDigitToDigit(digit1=1, digit2=2, private_comparor=None)
-game[14]['model'] = WhichIsSmallest(private_digit=None)
-#game[15]['model'] = WhichIsLargest(private_digit=None)
-#game[16]['model'] = CountEvenVsOdd(private_comparor=None)
-#game[17]['model'] = CountEven(private_count=None)
-#game[18]['model'] = IsSumEvenOdd(private_even=None)
-#game[19]['model'] = CompareDigitSumToConstant(digits=[0, 1], compared_to_constant=6, private_comparor=None)
-#game[20]['model'] = DoesAnyDigitRepeat(private_bool=None)
-#game[21]['model'] = DoesAnyDigitRepeatTimes(count=2, private_bool=None)
-#game[22]['model'] = IsAscendingDescendingNeither(private_order=None)
-#game[23]['model'] = CompareSumToConstant(compared_to_constant=6, private_comparor=None)
-#game[24]['model'] = DoesAscendingSequenceExist(private_bool=None)
-#game[25]['model'] = DoesAscendingOrDescendingSequenceExist(private_bool=None)
-#game[26]['model'] = CompareUnknownToConstant(compared_to_constant=3, comparor='<', priviate_digit=None)
-#game[27]['model'] = CompareUnknownToConstant(compared_to_constant=4, comparor='<', priviate_digit=None)
-#game[28]['model'] = CompareUnknownToConstant(compared_to_constant=1, comparor='=', priviate_digit=None)
-#game[29]['model'] = CompareUnknownToConstant(compared_to_constant=3, comparor='=', priviate_digit=None)
-#game[30]['model'] = CompareUnknownToConstant(compared_to_constant=4, comparor='=', priviate_digit=None)
-#game[31]['model'] = CompareUnknownToConstant(compared_to_constant=1, comparor='>', priviate_digit=None)
-#game[32]['model'] = CompareUnknownToConstant(compared_to_constant=3, comparor='>', priviate_digit=None)
-#game[33]['model'] = IsEvenOdd(private_digit=None, priviate_even=None)
-#game[34]['model'] = WhichIsSmallestOrTied(private_digit=None)
-#game[35]['model'] = WhichIsLaregestOrTied(private_digit=None)
-#game[36]['model'] = IsSumMultipleOf(private_multiple=None)
-#game[37]['model'] = CompareSumOfUnknownsToConstant(compared_to_constant=4, comparor='=' private_digits=None)
-#game[38]['model'] = CompareSumOfUnknownsToConstant(compared_to_constant=6, comparor='=' private_digits=None)
-#game[39]['model'] = CompareUnknownToConstant(compared_to_constant=1, private_comparor=None, priviate_digit=None)
-#game[40]['model'] = CompareUnknownToConstant(compared_to_constant=3, private_comparor=None, priviate_digit=None)
-#game[41]['model'] = CompareUnknownToConstant(compared_to_constant=4, private_comparor=None, priviate_digit=None)
-#game[42]['model'] = WhichIsSmallestOrLargest(private_digit=None, private_smallest=None)
-#game[43]['model'] = CompareDigitToUnknown(digit=0, private_comparor=None, priviate_digit=None)
-#game[44]['model'] = CompareDigitToUnknown(digit=1, private_comparor=None, priviate_digit=None)
-#game[45]['model'] = CountDigitsOr(count_of=[1, 3], private_count=None, private_target=None)
-#game[46]['model'] = CountDigitsOr(count_of=[3, 4], private_count=None, private_target=None)
-#game[47]['model'] = CountDigitsOr(count_of=[1, 4], private_count=None, private_target=None)
-#game[48]['model'] = CompareUnkownToUnknown(private_comparor=None, priviate_digit1=None, priviate_digit2=None)
 
+# Verifier models indexed by their number. Kept apart from the descriptions since
+# verifiers_from_numbers only ever needs these. There is no card 0
+MODELS = [None] * 49
+#
+#MODELS[1] = CompareDigitToConstant(digit=0, compared_to_constant=1, private_comparor=None)
+#MODELS[2] = CompareDigitToConstant(digit=0, compared_to_constant=3, private_comparor=None)
+#MODELS[3] = CompareDigitToConstant(digit=1, compared_to_constant=3, private_comparor=None)
+MODELS[4] = CompareDigitToConstant(digit=1, compared_to_constant=4, private_comparor=None)
+#MODELS[5] = IsEvenOddDigit(digit=0, private_even=None)
+#MODELS[6] = IsEvenOddDigit(digit=1, private_even=None)
+#MODELS[7] = IsEvenOddDigit(digit=2, private_even=None)
+#MODELS[8] = CountDigits(count_of=1, private_count=None)
+MODELS[9] = CountDigits(count_of=3, private_count=None)
+#MODELS[10] = CountDigits(count_of=4, private_count=None)
+MODELS[11] = CompareDigitToDigit(digit1=0, digit2=1, private_comparor=None)
+#MODELS[12] = CompareDigitToDigit(digit1=0, digit2=2, private_comparor=None)
+#MODELS[13] = CompareDigitToDigit(digit1=1, digit2=2, private_comparor=None)
+MODELS[14] = WhichIsSmallest(private_digit=None)
+#MODELS[15] = WhichIsLargest(private_digit=None)
+#MODELS[16] = CountEvenVsOdd(private_comparor=None)
+#MODELS[17] = CountEven(private_count=None)
+#MODELS[18] = IsSumEvenOdd(private_even=None)
+#MODELS[19] = CompareDigitSumToConstant(digits=[0, 1], compared_to_constant=6, private_comparor=None)
+#MODELS[20] = DoesAnyDigitRepeat(private_bool=None)
+#MODELS[21] = DoesAnyDigitRepeatTimes(count=2, private_bool=None)
+#MODELS[22] = IsAscendingDescendingNeither(private_order=None)
+#MODELS[23] = CompareSumToConstant(compared_to_constant=6, private_comparor=None)
+#MODELS[24] = DoesAscendingSequenceExist(private_bool=None)
+#MODELS[25] = DoesAscendingOrDescendingSequenceExist(private_bool=None)
+#MODELS[26] = CompareUnknownToConstant(compared_to_constant=3, comparor='<', priviate_digit=None)
+#MODELS[27] = CompareUnknownToConstant(compared_to_constant=4, comparor='<', priviate_digit=None)
+#MODELS[28] = CompareUnknownToConstant(compared_to_constant=1, comparor='=', priviate_digit=None)
+#MODELS[29] = CompareUnknownToConstant(compared_to_constant=3, comparor='=', priviate_digit=None)
+#MODELS[30] = CompareUnknownToConstant(compared_to_constant=4, comparor='=', priviate_digit=None)
+#MODELS[31] = CompareUnknownToConstant(compared_to_constant=1, comparor='>', priviate_digit=None)
+#MODELS[32] = CompareUnknownToConstant(compared_to_constant=3, comparor='>', priviate_digit=None)
+#MODELS[33] = IsEvenOdd(private_digit=None, priviate_even=None)
+#MODELS[34] = WhichIsSmallestOrTied(private_digit=None)
+#MODELS[35] = WhichIsLaregestOrTied(private_digit=None)
+#MODELS[36] = IsSumMultipleOf(private_multiple=None)
+#MODELS[37] = CompareSumOfUnknownsToConstant(compared_to_constant=4, comparor='=' private_digits=None)
+#MODELS[38] = CompareSumOfUnknownsToConstant(compared_to_constant=6, comparor='=' private_digits=None)
+#MODELS[39] = CompareUnknownToConstant(compared_to_constant=1, private_comparor=None, priviate_digit=None)
+#MODELS[40] = CompareUnknownToConstant(compared_to_constant=3, private_comparor=None, priviate_digit=None)
+#MODELS[41] = CompareUnknownToConstant(compared_to_constant=4, private_comparor=None, priviate_digit=None)
+#MODELS[42] = WhichIsSmallestOrLargest(private_digit=None, private_smallest=None)
+#MODELS[43] = CompareDigitToUnknown(digit=0, private_comparor=None, priviate_digit=None)
+#MODELS[44] = CompareDigitToUnknown(digit=1, private_comparor=None, priviate_digit=None)
+#MODELS[45] = CountDigitsOr(count_of=[1, 3], private_count=None, private_target=None)
+#MODELS[46] = CountDigitsOr(count_of=[3, 4], private_count=None, private_target=None)
+#MODELS[47] = CountDigitsOr(count_of=[1, 4], private_count=None, private_target=None)
+#MODELS[48] = CompareUnkownToUnknown(private_comparor=None, priviate_digit1=None, priviate_digit2=None)
 
 def verifiers_from_numbers(numbers):
     ''' Return a list of verifiers from a list of numbers '''
     ''' Example: 4, 9, 11, 14 '''
-    return [game[number]['model'] for number in numbers]
\ No newline at end of file
+    return [MODELS[number] for number in numbers]